@@ -1,11 +1,13 @@
 import json
 import re
-from typing import Dict, List, Any, TypedDict, Annotated
+from typing import Dict, List, Any, Optional, TypedDict, Annotated
 from langgraph.graph.message import add_messages
 from models.llm_providers import LLMProvider
+from models.model_router import VALID_INTENTS
+from models.policy_store import load_policy_store
 from models.vector_rag import VectorRAG
 from tools.refund_calculator import RefundCalculator
-from utils.helpers import load_json_file, extract_parameters_regex
+from utils.helpers import extract_parameters_regex
 
 # state for our agent
 class AgentState(TypedDict):
@@ -13,6 +15,7 @@ class AgentState(TypedDict):
     user_query: str
     intent: str
     extracted_params: Dict[str, Any]
+    rag_filters: Dict[str, Any]
     rag_results: List[Dict]
     tool_result: Dict[str, Any]
     missing_params: List[str]
@@ -21,10 +24,14 @@ class AgentState(TypedDict):
 
 # LangGraph integration
 class LLMEnhancedReturnsAgent:
-    def __init__(self, llm_provider: LLMProvider):
+    def __init__(self, llm_provider: LLMProvider, vector_rag: Optional[VectorRAG] = None):
         self.llm_provider = llm_provider
-        self.policies = load_json_file("data/policies.json")
-        self.vector_rag = VectorRAG(llm_provider, self.policies)
+        if vector_rag is None:
+            self.policies = load_policy_store("data/policies.json")
+            vector_rag = VectorRAG(llm_provider, self.policies)
+        else:
+            self.policies = vector_rag.policies
+        self.vector_rag = vector_rag
         self.refund_calculator = RefundCalculator()
     
     # LLM prompt to classify user intent
@@ -48,10 +55,10 @@ class LLMEnhancedReturnsAgent:
         Respond with only one word: rag_only, tool_only, or both
         """
         
-        response = self.llm_provider.generate_response(prompt, max_tokens=10)
+        response = self.llm_provider.generate_response(prompt, max_tokens=10, task="classify_intent")
         intent = response.strip().lower().replace("_", "_")
         
-        if intent not in ["rag_only", "tool_only", "both"]:
+        if intent not in VALID_INTENTS:
             intent = "both"
             
         state["intent"] = intent
@@ -77,7 +84,7 @@ class LLMEnhancedReturnsAgent:
         """
         
         try:
-            response = self.llm_provider.generate_response(prompt, max_tokens=100)
+            response = self.llm_provider.generate_response(prompt, max_tokens=100, task="extract_parameters")
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
             if json_match:
                 extracted = json.loads(json_match.group())
@@ -132,7 +139,8 @@ class LLMEnhancedReturnsAgent:
     # Perform RAG search and update state
     def perform_rag_search(self, state: AgentState) -> AgentState:
         query = state["user_query"]
-        state["rag_results"] = self.vector_rag.semantic_search(query)
+        filters = state.get("rag_filters") or None
+        state["rag_results"] = self.vector_rag.semantic_search(query, filters=filters)
         return state
     
     # final response following the required format
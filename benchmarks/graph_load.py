@@ -0,0 +1,160 @@
+"""Offline load/regression test of the agent graph using recorded LLM responses.
+
+Record once against Groq (needs GROQ_API_KEY) and commit the store so CI can replay it:
+    python -m benchmarks.graph_load record --store data/recordings.jsonl
+Replay with no network:
+    python -m benchmarks.graph_load replay --store data/recordings.jsonl --requests 20000 --latency-ms 2
+
+Recording also stores each query's final answer. Replay exits non-zero if any answer
+differs from the recorded one or a prompt has no recording (unless errors are injected).
+Re-record after intentionally changing prompts or answer formatting.
+
+Replay runs one graph per worker process (default: one per CPU core), because
+graph.invoke holds the GIL and threads only add contention. With zero synthetic
+latency one core sustains about 420 req/s (p99 ~4.4 ms), nearly all of it LangGraph's
+per-invoke overhead, so thousands of req/s needs roughly one core per 400 req/s.
+With --latency-ms set, workers sleep inside each call, so use more workers than cores.
+"""
+import argparse
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from langchain_core.messages import HumanMessage
+from agents.base_agent import LLMEnhancedReturnsAgent
+from agents.graph_builder import GraphBuilder
+from models.llm_providers import GroqProvider, PlaybackProvider, RecordingProvider
+
+TEST_QUERIES = [
+    "What's your return window for electronics?",
+    "Do you charge a restocking fee for opened items?",
+    "I paid $300 for a sealed blender, delivered 10 days ago. How much refund?",
+    "Headphones for $200, opened, delivered 12 days ago — refund?",
+    "I bought a jacket last week for $120; how much can I get back?",
+    "I'm past 35 days — can I still return?",
+    "Return policy + estimate for a sealed phone $900, 14 days since delivery.",
+    "I heard there's no restocking fee for electronics."
+]
+
+def initial_state(query: str):
+    return {
+        "messages": [HumanMessage(content=query)],
+        "user_query": query,
+        "intent": "",
+        "extracted_params": {},
+        "rag_filters": {},
+        "rag_results": [],
+        "tool_result": {},
+        "missing_params": [],
+        "final_answer": "",
+        "citations": []
+    }
+
+def build_graph(llm_provider):
+    return GraphBuilder(LLMEnhancedReturnsAgent(llm_provider)).build_graph()
+
+def record(args):
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise SystemExit("GROQ_API_KEY is required to record")
+    provider = RecordingProvider(GroqProvider(api_key, args.model), args.store, overwrite=True)
+    graph = build_graph(provider)
+    for query in TEST_QUERIES:
+        final_answer = graph.invoke(initial_state(query))["final_answer"]
+        provider.record("answer", query, final_answer)
+        print(f"{query}\n  -> {final_answer!r}")
+    print(f"Recorded to {args.store}")
+
+# per-process provider and graph, built once by the pool initializer
+_REPLAY_PROVIDER = None
+_REPLAY_GRAPH = None
+
+def _init_replay_worker(store: str, latency_ms: float, jitter_ms: float, error_rate: float, seed):
+    global _REPLAY_PROVIDER, _REPLAY_GRAPH
+    _REPLAY_PROVIDER = PlaybackProvider(store, latency_ms=latency_ms, latency_jitter_ms=jitter_ms,
+                                        error_rate=error_rate, seed=seed)
+    _REPLAY_GRAPH = build_graph(_REPLAY_PROVIDER)
+
+# Run a batch of queries in a worker; returns (query, answer, latency) rows and the batch's provider stats
+def _replay_batch(queries):
+    stats_before = dict(_REPLAY_PROVIDER.stats)
+    rows = []
+    for query in queries:
+        start = time.perf_counter()
+        try:
+            answer = _REPLAY_GRAPH.invoke(initial_state(query))["final_answer"]
+        except Exception as e:
+            answer = f"<exception: {e}>"
+        rows.append((query, answer, time.perf_counter() - start))
+    stats = {key: value - stats_before[key] for key, value in _REPLAY_PROVIDER.stats.items()}
+    return rows, stats
+
+def replay(args):
+    store = PlaybackProvider(args.store)
+    expected = {query: store.recorded("answer", query) for query in TEST_QUERIES}
+    unrecorded = [query for query, answer in expected.items() if answer is None]
+    if unrecorded:
+        raise SystemExit(f"No recorded answer for {len(unrecorded)} queries; re-run `record`: {unrecorded}")
+    queries = [TEST_QUERIES[i % len(TEST_QUERIES)] for i in range(args.requests)]
+    batches = [queries[i:i + args.batch_size] for i in range(0, len(queries), args.batch_size)]
+
+    # graph.invoke holds the GIL, so load is spread over processes rather than threads
+    results = []
+    stats = {"hits": 0, "misses": 0, "injected_errors": 0}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_replay_worker,
+                             initargs=(args.store, args.latency_ms, args.jitter_ms, args.error_rate, args.seed)) as executor:
+        # warm every worker so startup is not counted as load
+        list(executor.map(_replay_batch, [[] for _ in range(args.workers)]))
+        start = time.perf_counter()
+        for rows, batch_stats in executor.map(_replay_batch, batches):
+            results.extend(rows)
+            for key, value in batch_stats.items():
+                stats[key] += value
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, _, latency in results)
+    mismatches = defaultdict(set)
+    mismatched = 0
+    for query, answer, _ in results:
+        if answer != expected[query]:
+            mismatches[query].add(answer)
+            mismatched += 1
+
+    print(f"requests:      {len(results)} in {elapsed:.2f}s on {args.workers} workers "
+          f"({len(results) / elapsed:.0f} req/s, {len(results) / elapsed / args.workers:.0f} req/s per worker)")
+    print(f"latency p50:   {latencies[len(latencies) // 2] * 1000:.2f} ms")
+    print(f"latency p99:   {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    print(f"provider:      {stats}")
+    print(f"mismatched answers: {mismatched}")
+    for query, answers in mismatches.items():
+        print(f"  {query}\n    expected: {expected[query]!r}")
+        for answer in sorted(answers):
+            print(f"    got:      {answer!r}")
+    if args.error_rate == 0 and (mismatches or stats["misses"]):
+        raise SystemExit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record")
+    record_parser.add_argument("--store", default="data/recordings.jsonl")
+    record_parser.add_argument("--model", default="llama3-8b-8192")
+    record_parser.set_defaults(func=record)
+
+    replay_parser = subparsers.add_parser("replay")
+    replay_parser.add_argument("--store", default="data/recordings.jsonl")
+    replay_parser.add_argument("--requests", type=int, default=20000)
+    replay_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    replay_parser.add_argument("--batch-size", type=int, default=250)
+    replay_parser.add_argument("--latency-ms", type=float, default=0.0)
+    replay_parser.add_argument("--jitter-ms", type=float, default=0.0)
+    replay_parser.add_argument("--error-rate", type=float, default=0.0)
+    replay_parser.add_argument("--seed", type=int, default=None)
+    replay_parser.set_defaults(func=replay)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
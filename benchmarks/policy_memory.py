@@ -0,0 +1,90 @@
+"""Compare bytes per policy for the dict-based corpus vs the compact PolicyStore.
+
+Three layouts are measured, each in a fresh interpreter so no earlier allocation
+(e.g. a warm string table) leaks into the numbers:
+  dicts          - list of policy dicts as loaded from JSON
+  dicts + index  - the dicts plus the word -> list-of-dicts keyword index VectorRAG used to build
+  PolicyStore    - __slots__ records with repeated text shared
+
+Two corpora are used: one where every merchant republishes identical policy text,
+and one where every policy's content is unique.
+
+Usage: python -m benchmarks.policy_memory [num_policies]
+"""
+import gc
+import json
+import re
+import subprocess
+import sys
+import tracemalloc
+from models.policy_store import PolicyStore
+from utils.helpers import load_json_file
+
+# Synthetic per-merchant catalog built from the base policies
+def build_corpus_json(num_policies: int, unique_content: bool = False) -> str:
+    base = load_json_file("data/policies.json")
+    corpus = []
+    for i in range(num_policies):
+        policy = dict(base[i % len(base)])
+        policy['id'] = f"{policy['id']}_{i}"
+        policy['merchant'] = f"merchant_{i // len(base)}"
+        if unique_content:
+            policy['content'] = f"{policy['content']} Reference {i}."
+        corpus.append(policy)
+    return json.dumps(corpus)
+
+def build_dicts(corpus_json: str):
+    return json.loads(corpus_json)
+
+def build_dicts_with_index(corpus_json: str):
+    policies = json.loads(corpus_json)
+    keyword_index = {}
+    for policy in policies:
+        text = f"{policy['title']} {policy['content']}".lower()
+        for word in dict.fromkeys(re.findall(r'\b\w+\b', text)):
+            keyword_index.setdefault(word, []).append(policy)
+    return policies, keyword_index
+
+def build_store(corpus_json: str):
+    return PolicyStore.from_dicts(json.loads(corpus_json))
+
+LAYOUTS = {
+    "dicts": build_dicts,
+    "dicts + index": build_dicts_with_index,
+    "PolicyStore": build_store,
+}
+
+def measure(layout: str, num_policies: int, unique_content: bool) -> int:
+    corpus_json = build_corpus_json(num_policies, unique_content)
+    gc.collect()
+    tracemalloc.start()
+    result = LAYOUTS[layout](corpus_json)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained
+
+# Run one measurement in a fresh interpreter and return retained bytes
+def measure_in_subprocess(layout: str, num_policies: int, unique_content: bool) -> int:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.policy_memory", "--child", layout, str(num_policies), str(int(unique_content))],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return int(output.strip())
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        print(measure(sys.argv[2], int(sys.argv[3]), bool(int(sys.argv[4]))))
+        return
+
+    num_policies = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"policies: {num_policies}")
+    for label, unique_content in (("duplicated text", False), ("unique content", True)):
+        print(f"{label}:")
+        retained = {layout: measure_in_subprocess(layout, num_policies, unique_content) for layout in LAYOUTS}
+        for layout, size in retained.items():
+            print(f"  {layout + ':':15} {size / num_policies:8.1f} bytes/policy  ({retained['dicts'] / size:.2f}x vs dicts)")
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,16 @@ import os
 from dotenv import load_dotenv
 
 from models.llm_providers import GroqProvider
+from models.model_router import ModelRouter
 from agents.base_agent import LLMEnhancedReturnsAgent
 from agents.graph_builder import GraphBuilder
 from langchain_core.messages import HumanMessage
 
 load_dotenv()
 
+# fast model that adaptive routing tries first for intent classification and parameter extraction
+FAST_MODEL = "llama3-8b-8192"
+
 # Streamlit Interface with Groq Integration
 def main():
     st.set_page_config(
@@ -51,11 +55,24 @@ def main():
                 help="Select your preferred Groq model"
             )
             
+            # routing needs a larger model to escalate to
+            adaptive_routing = st.checkbox(
+                "Adaptive model routing",
+                disabled=model == FAST_MODEL,
+                help=f"Use {FAST_MODEL} for intent/extraction and escalate to the selected model only when its output is invalid"
+            ) and model != FAST_MODEL
+            
             llm_provider = None
             
             if api_key:
                 try:
-                    llm_provider = GroqProvider(api_key, model)
+                    if adaptive_routing:
+                        llm_provider = st.session_state.get('model_router')
+                        if llm_provider is None or st.session_state.get('llm_provider') != (model, adaptive_routing):
+                            llm_provider = ModelRouter(GroqProvider(api_key, FAST_MODEL), GroqProvider(api_key, model))
+                            st.session_state.model_router = llm_provider
+                    else:
+                        llm_provider = GroqProvider(api_key, model)
                     st.success("✅ Groq configured")
                 except Exception as e:
                     st.error(f"Error configuring Groq: {str(e)}")
@@ -90,12 +107,12 @@ def main():
     
     # Initialize agent
     if llm_provider:
-        if 'llm_agent' not in st.session_state or st.session_state.get('llm_provider') != model:
+        if 'llm_agent' not in st.session_state or st.session_state.get('llm_provider') != (model, adaptive_routing):
             agent = LLMEnhancedReturnsAgent(llm_provider)
             graph_builder = GraphBuilder(agent)
             st.session_state.llm_agent = agent
             st.session_state.agent_graph = graph_builder.build_graph()
-            st.session_state.llm_provider = model
+            st.session_state.llm_provider = (model, adaptive_routing)
     else:
         st.warning("Configure Groq in the sidebar to use the agent")
         return
@@ -107,6 +124,11 @@ def main():
         
         # Process the query
         process_query_with_ui(prompt, llm_provider)
+    
+    # Routing stats, drawn after this run's query so they include it
+    if isinstance(llm_provider, ModelRouter) and llm_provider.stats():
+        with st.sidebar.expander("📊 Routing Stats"):
+            st.json(llm_provider.stats())
         
 # Process a query and update the UI with the response
 def process_query_with_ui(query: str, llm_provider):
@@ -134,6 +156,7 @@ def process_query_with_ui(query: str, llm_provider):
                     "user_query": query,
                     "intent": "",
                     "extracted_params": {},
+                    "rag_filters": {},
                     "rag_results": [],
                     "tool_result": {},
                     "missing_params": [],
@@ -1,9 +1,17 @@
-from typing import List
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
 from abc import ABC, abstractmethod
 
 class LLMProvider(ABC):
+    # task names the calling step (e.g. "classify_intent") so providers can pick a model per task
     @abstractmethod
-    def generate_response(self, prompt: str, max_tokens: int = 500) -> str:
+    def generate_response(self, prompt: str, max_tokens: int = 500, task: Optional[str] = None) -> str:
         pass
     
     @abstractmethod
@@ -12,15 +20,16 @@ class LLMProvider(ABC):
 
 # Groq Implementation
 class GroqProvider(LLMProvider):
-    def __init__(self, api_key: str, model: str = "llama3-8b-8192"):
+    def __init__(self, api_key: str, model: str = "llama3-8b-8192", task_models: Optional[Dict[str, str]] = None):
         import groq
         self.client = groq.Groq(api_key=api_key)
         self.model = model
+        self.task_models = task_models or {}
     
-    def generate_response(self, prompt: str, max_tokens: int = 500) -> str:
+    def generate_response(self, prompt: str, max_tokens: int = 500, task: Optional[str] = None) -> str:
         try:
             response = self.client.chat.completions.create(
-                model=self.model,
+                model=self.task_models.get(task, self.model),
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=max_tokens,
                 temperature=0.1
@@ -31,4 +40,103 @@ class GroqProvider(LLMProvider):
     
     def generate_embedding(self, text: str) -> List[float]:
         # Groq doesn't provide embeddings, so we'll use a simple TF-IDF approach
-        return []
\ No newline at end of file
+        return []
+
+
+# Key for a recorded call; prompts are hashed so the store stays compact
+def recording_key(kind: str, payload: str, max_tokens: int = 0) -> str:
+    return hashlib.sha1(f"{kind}\0{max_tokens}\0{payload}".encode("utf-8")).hexdigest()
+
+# Short, distinguishing description of a prompt: its Query line, else its tail
+def describe_prompt(prompt: str) -> str:
+    query_match = re.search(r'Query: "(.*)"', prompt)
+    if query_match:
+        return f"query {query_match.group(1)[:80]!r}"
+    return f"prompt ending {' '.join(prompt.split())[-80:]!r}"
+
+# Wraps a real provider and appends every prompt -> response pair to a JSONL store
+class RecordingProvider(LLMProvider):
+    def __init__(self, provider: LLMProvider, path: str, overwrite: bool = False):
+        self.provider = provider
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if overwrite:
+            open(path, "w", encoding="utf-8").close()
+
+    # Store any extra value (e.g. an expected final answer) alongside the LLM calls
+    def record(self, kind: str, payload: str, value, max_tokens: int = 0):
+        line = json.dumps({"key": recording_key(kind, payload, max_tokens), "value": value}, separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+
+    def generate_response(self, prompt: str, max_tokens: int = 500, task: Optional[str] = None) -> str:
+        response = self.provider.generate_response(prompt, max_tokens, task)
+        self.record("response", prompt, response, max_tokens)
+        return response
+
+    def generate_embedding(self, text: str) -> List[float]:
+        embedding = self.provider.generate_embedding(text)
+        self.record("embedding", text, embedding)
+        return embedding
+
+# Serves recorded responses offline, with optional synthetic latency and error injection
+class PlaybackProvider(LLMProvider):
+    def __init__(self, path: str, latency_ms: float = 0.0, latency_jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, strict: bool = True, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.strict = strict
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "injected_errors": 0}
+        self.recordings: Dict[str, object] = {}
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.recordings[entry["key"]] = entry["value"]
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _simulate_call(self) -> bool:
+        with self._lock:
+            jitter = self._random.uniform(-self.latency_jitter_ms, self.latency_jitter_ms) if self.latency_jitter_ms else 0.0
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        delay = max(0.0, self.latency_ms + jitter) / 1000.0
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    # Value stored with RecordingProvider.record, or None if absent
+    def recorded(self, kind: str, payload: str, max_tokens: int = 0):
+        return self.recordings.get(recording_key(kind, payload, max_tokens))
+
+    def _lookup(self, key: str, description: str):
+        if key in self.recordings:
+            self._count("hits")
+            return self.recordings[key]
+        self._count("misses")
+        if self.strict:
+            raise KeyError(f"No recording with key {key} for {description}")
+        return None
+
+    def generate_response(self, prompt: str, max_tokens: int = 500, task: Optional[str] = None) -> str:
+        if self._simulate_call():
+            self._count("injected_errors")
+            # same failure shape as GroqProvider
+            return "Error generating response: injected playback error"
+        response = self._lookup(recording_key("response", prompt, max_tokens), describe_prompt(prompt))
+        if response is None:
+            return "Error generating response: no recording for prompt"
+        return response
+
+    def generate_embedding(self, text: str) -> List[float]:
+        embedding = self._lookup(recording_key("embedding", text), f"embedding of {text[:80]!r}")
+        return embedding if embedding is not None else []
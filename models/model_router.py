@@ -0,0 +1,92 @@
+import json
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+from .llm_providers import LLMProvider
+
+VALID_INTENTS = ["rag_only", "tool_only", "both"]
+
+# Intent output must be exactly one of the known intents
+def is_valid_intent(response: str) -> bool:
+    return response.strip().lower() in VALID_INTENTS
+
+# fields extract_parameters_llm reads, and the value types it can parse for each
+EXTRACTION_FIELDS = {
+    "purchase_price": (str, int, float),
+    "days_since_delivery": (str, int, float),
+    "opened": (str,),
+    "category": (str,),
+}
+
+# Extraction output must be a JSON object with every expected field, each of a usable type
+def is_valid_extraction(response: str) -> bool:
+    json_match = re.search(r'\{.*\}', response, re.DOTALL)
+    try:
+        extracted = json.loads(json_match.group() if json_match else response)
+    except ValueError:
+        return False
+    if not isinstance(extracted, dict):
+        return False
+    for field, types in EXTRACTION_FIELDS.items():
+        value = extracted.get(field)
+        if isinstance(value, bool) or not isinstance(value, types):
+            return False
+    return True
+
+DEFAULT_VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    "classify_intent": is_valid_intent,
+    "extract_parameters": is_valid_extraction,
+}
+
+DEFAULT_FAST_TASKS = ("classify_intent", "extract_parameters", "rag_keywords")
+
+# Sends short tasks to a fast provider and escalates to a larger one when the output fails validation
+class ModelRouter(LLMProvider):
+    def __init__(self, fast_provider: LLMProvider, strong_provider: LLMProvider,
+                 validators: Optional[Dict[str, Callable[[str], bool]]] = None,
+                 fast_tasks: Iterable[str] = DEFAULT_FAST_TASKS):
+        self.fast_provider = fast_provider
+        self.strong_provider = strong_provider
+        self.validators = DEFAULT_VALIDATORS if validators is None else validators
+        self.fast_tasks = set(fast_tasks) | set(self.validators)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _record(self, task: Optional[str], latency: float, escalated: bool):
+        with self._lock:
+            entry = self._stats.setdefault(task or "default", {"calls": 0, "escalations": 0, "total_latency_ms": 0.0})
+            entry["calls"] += 1
+            entry["escalations"] += int(escalated)
+            entry["total_latency_ms"] += latency * 1000
+
+    def generate_response(self, prompt: str, max_tokens: int = 500, task: Optional[str] = None) -> str:
+        start = time.perf_counter()
+        if task not in self.fast_tasks:
+            response = self.strong_provider.generate_response(prompt, max_tokens, task)
+            self._record(task, time.perf_counter() - start, False)
+            return response
+
+        response = self.fast_provider.generate_response(prompt, max_tokens, task)
+        validator = self.validators.get(task)
+        escalated = validator is not None and not validator(response)
+        if escalated:
+            response = self.strong_provider.generate_response(prompt, max_tokens, task)
+        self._record(task, time.perf_counter() - start, escalated)
+        return response
+
+    def generate_embedding(self, text: str) -> List[float]:
+        return self.fast_provider.generate_embedding(text)
+
+    # Per-task call count, escalation rate and mean latency
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                task: {
+                    "calls": entry["calls"],
+                    "escalations": entry["escalations"],
+                    "escalation_rate": entry["escalations"] / entry["calls"],
+                    "avg_latency_ms": entry["total_latency_ms"] / entry["calls"],
+                }
+                for task, entry in self._stats.items()
+            }
@@ -0,0 +1,95 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from utils.helpers import load_json_file
+
+_FIELDS = ('id', 'title', 'content', 'category', 'merchant')
+
+# Share one copy of equal strings through a table owned by the caller
+def _dedupe(value: Any, strings: Optional[Dict[str, str]]) -> Any:
+    if strings is None or not isinstance(value, str):
+        return value
+    return strings.setdefault(value, value)
+
+# Compact policy record; supports dict-style access so callers can keep using policy['title']
+class PolicyRecord:
+    __slots__ = _FIELDS + ('extra',)
+
+    def __init__(self, id: str, title: str, content: str, category: Optional[str] = None,
+                 merchant: Optional[str] = None, extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.title = title
+        self.content = content
+        self.category = category
+        self.merchant = merchant
+        self.extra = extra or None
+
+    # ids are unique per policy, so only the other text fields go through the dedupe table
+    @classmethod
+    def from_dict(cls, policy: Dict[str, Any], strings: Optional[Dict[str, str]] = None) -> "PolicyRecord":
+        extra = {_dedupe(k, strings): _dedupe(v, strings) for k, v in policy.items() if k not in _FIELDS}
+        return cls(policy['id'], _dedupe(policy['title'], strings), _dedupe(policy['content'], strings),
+                   _dedupe(policy.get('category'), strings), _dedupe(policy.get('merchant'), strings), extra)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        policy = {field: getattr(self, field) for field in _FIELDS if getattr(self, field) is not None}
+        if self.extra:
+            policy.update(self.extra)
+        return policy
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def __repr__(self) -> str:
+        return f"PolicyRecord(id={self.id!r}, title={self.title!r})"
+
+# Policy corpus held as compact records in their original order
+class PolicyStore:
+    def __init__(self, records: Iterable[PolicyRecord]):
+        self.records: List[PolicyRecord] = list(records)
+
+    # Repeated text (e.g. the same policy republished per merchant) is stored once; the
+    # dedupe table only lives for the build, so it adds no lasting memory
+    @classmethod
+    def from_dicts(cls, policies: Iterable[Dict[str, Any]]) -> "PolicyStore":
+        strings: Dict[str, str] = {}
+        return cls(p if isinstance(p, PolicyRecord) else PolicyRecord.from_dict(p, strings) for p in policies)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[PolicyRecord]:
+        return iter(self.records)
+
+    def __getitem__(self, index: int) -> PolicyRecord:
+        return self.records[index]
+
+# Load a policy file once per process so agents and Streamlit sessions share one store
+@lru_cache(maxsize=None)
+def load_policy_store(file_path: str) -> PolicyStore:
+    return PolicyStore.from_dicts(load_json_file(file_path))
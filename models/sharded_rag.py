@@ -0,0 +1,128 @@
+import heapq
+import os
+import re
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple, Union
+from .llm_providers import LLMProvider
+from .policy_store import PolicyStore
+from .vector_rag import VectorRAG, detect_query_category, matches_filters, policy_category, score_policy
+
+SHARD_MODES = ("category", "merchant", "hash")
+
+# shards owned by this worker process, set once by the pool initializer
+_WORKER_SHARDS: Dict[int, List[Tuple[int, Dict]]] = {}
+
+def _init_worker(shards: Dict[int, List[Tuple[int, Dict]]]):
+    global _WORKER_SHARDS
+    _WORKER_SHARDS = shards
+
+def _search_worker_shards(shard_ids: List[int], query: str, top_k: int, filters: Optional[Dict[str, Any]]) -> List[List[Tuple[int, int]]]:
+    return [search_shard(_WORKER_SHARDS[shard_id], query, top_k, filters) for shard_id in shard_ids]
+
+# Score one shard and keep its top_k as (-score, position), sorted ascending
+def search_shard(shard: List[Tuple[int, Dict]], query: str, top_k: int, filters: Optional[Dict[str, Any]] = None) -> List[Tuple[int, int]]:
+    query_lower = query.lower()
+    query_words = re.findall(r'\b\w+\b', query_lower)
+    detected_category = detect_query_category(query_lower)
+
+    hits = []
+    for position, policy in shard:
+        if not matches_filters(policy, filters):
+            continue
+        score = score_policy(policy, query_lower, query_words, detected_category)
+        if score > 0:
+            hits.append((-score, position))
+    return heapq.nsmallest(top_k, hits)
+
+# VectorRAG partitioned by category, merchant or id hash, searched in parallel on worker processes
+class ShardedVectorRAG(VectorRAG):
+    def __init__(self, llm_provider: LLMProvider, policies: Union[PolicyStore, List[Dict]], num_shards: int = 4,
+                 shard_by: str = "category", max_workers: Optional[int] = None):
+        if shard_by not in SHARD_MODES:
+            raise ValueError(f"shard_by must be one of {SHARD_MODES}, got {shard_by!r}")
+        self.num_shards = num_shards
+        self.shard_by = shard_by
+        self.max_workers = max_workers if max_workers is not None else min(num_shards, os.cpu_count() or 1)
+        self._executors: List[ProcessPoolExecutor] = []
+        self._shard_worker: Dict[int, int] = {}
+        # guards starting, submitting to and shutting down the worker pools
+        self._workers_lock = threading.Lock()
+        super().__init__(llm_provider, policies)
+        self.build_shards()
+
+    def _shard_key(self, policy: Dict) -> Any:
+        if self.shard_by == "category":
+            return policy_category(policy)
+        if self.shard_by == "merchant":
+            return policy.get('merchant')
+        return zlib.crc32(str(policy['id']).encode("utf-8")) % self.num_shards
+
+    # Assign each policy to a shard, remembering its global position for stable merging
+    def build_shards(self):
+        self.close()
+        by_key: Dict[Any, List[Tuple[int, Dict]]] = {}
+        for position, policy in enumerate(self.policies):
+            by_key.setdefault(self._shard_key(policy), []).append((position, policy))
+        self.shard_keys: List[Any] = list(by_key)
+        self.shards: List[List[Tuple[int, Dict]]] = list(by_key.values())
+
+    # Shard ids that can hold matches for the given filters
+    def candidate_shards(self, filters: Optional[Dict[str, Any]] = None) -> List[int]:
+        candidates = list(range(len(self.shards)))
+        if self.shard_by != "hash" and filters and self.shard_by in filters:
+            wanted = filters[self.shard_by]
+            wanted = set(wanted) if isinstance(wanted, (list, tuple, set)) else {wanted}
+            candidates = [i for i in candidates if self.shard_keys[i] in wanted]
+        return candidates
+
+    # One single-process pool per worker, each initialized with only the shards it owns (caller holds the lock)
+    def _start_workers(self):
+        num_workers = min(self.max_workers, len(self.shards))
+        loads = [0] * num_workers
+        owned: List[Dict[int, List[Tuple[int, Dict]]]] = [{} for _ in range(num_workers)]
+        for shard_id in sorted(range(len(self.shards)), key=lambda i: len(self.shards[i]), reverse=True):
+            worker = loads.index(min(loads))
+            loads[worker] += len(self.shards[shard_id])
+            owned[worker][shard_id] = self.shards[shard_id]
+            self._shard_worker[shard_id] = worker
+        self._executors = [
+            ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(shards,))
+            for shards in owned
+        ]
+
+    # Search candidate shards in parallel and heap-merge their top_k lists
+    def keyword_search(self, query: str, top_k: int = 3, filters: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        shard_ids = self.candidate_shards(filters)
+        if len(shard_ids) <= 1 or self.max_workers <= 1:
+            shard_hits = [search_shard(self.shards[i], query, top_k, filters) for i in shard_ids]
+        else:
+            with self._workers_lock:
+                if not self._executors:
+                    self._start_workers()
+                by_worker: Dict[int, List[int]] = {}
+                for shard_id in shard_ids:
+                    by_worker.setdefault(self._shard_worker[shard_id], []).append(shard_id)
+                futures = [
+                    self._executors[worker].submit(_search_worker_shards, ids, query, top_k, filters)
+                    for worker, ids in by_worker.items()
+                ]
+            shard_hits = [hits for future in futures for hits in future.result()]
+
+        merged = heapq.merge(*shard_hits)
+        return [{'policy': self.policies[position], 'score': -neg_score} for neg_score, position in islice(merged, top_k)]
+
+    # Shut down the worker processes; they are restarted on the next parallel search
+    def close(self):
+        with self._workers_lock:
+            executors, self._executors, self._shard_worker = self._executors, [], {}
+        for executor in executors:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()